@@ -0,0 +1,201 @@
+# src/app.py
+"""
+Application bootstrap for the Telegram bot.
+
+Responsibilities:
+- Load Settings (src.config.get_settings)
+- Configure logging
+- Build telegram Application with shared aiohttp.ClientSession
+- Create and register PriceService into app.bot_data
+- Provide warmup task to preload common pairs
+- Graceful shutdown: close session and clear caches
+
+Usage:
+    python -m src.app
+
+or, embedded:
+    from src.app import build_app
+    app = build_app()
+    app.run_polling()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+import aiohttp
+from telegram.ext import Application
+
+from .config import Settings, get_settings
+from .prices import PriceService
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_WARMUP_PAIRS = [("bitcoin", "usd"), ("ethereum", "usd"), ("tether", "usd")]
+
+# the rate-limit check runs before every update; an unreachable Redis must
+# fail fast so handlers fall back to the in-memory limiter instead of
+# waiting on the OS connect timeout (redis-py defaults to no timeout)
+_REDIS_TIMEOUT = 0.2
+# upper bound on updates processed at the same time
+_CONCURRENT_UPDATES = 64
+# seconds polling may be delayed by the startup warmup; during an upstream
+# outage a fetch costs http_retries * http_timeout plus backoff (~31s)
+_WARMUP_TIMEOUT = 5.0
+
+
+def _configure_logging(level: str) -> None:
+    fmt = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    logging.basicConfig(level=getattr(logging, level.upper(), logging.INFO), format=fmt)
+    # reduce noisy libraries optionally
+    logging.getLogger("aiohttp").setLevel(logging.WARNING)
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+
+def build_app(settings: Optional[Settings] = None) -> Application:
+    """
+    Build and return a configured telegram.ext.Application instance.
+
+    Registers into app.bot_data:
+      - "settings": Settings
+      - "parse_mode": settings.parse_mode
+      - "redis": redis.asyncio.Redis (only when REDIS_URL is set)
+    and, from post_init once the Application's event loop is running
+    (both are closed again by post_shutdown):
+      - "http_session": aiohttp.ClientSession
+      - "price_service": PriceService
+
+    Callers should later add handlers before run.
+    """
+    settings = settings or get_settings()
+    _configure_logging(settings.log_level)
+
+    # build telegram Application; the HTTP session is created and the cache
+    # warmed in post_init, inside the loop run_polling() starts, and released
+    # again in post_shutdown. Updates are handled concurrently (PTB defaults
+    # to one at a time): price lookups are I/O-bound, and only overlapping
+    # handlers can share a PriceBatcher window or an in-flight fetch
+    app = (
+        Application.builder()
+        .token(settings.bot_token)
+        .concurrent_updates(_CONCURRENT_UPDATES)
+        .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
+
+    # inject shared resources
+    app.bot_data["settings"] = settings
+    app.bot_data["parse_mode"] = settings.parse_mode
+    app.bot_data["rate_limit_cooldown"] = float(settings.rate_limit_cooldown)
+    if settings.redis_url:
+        # imported lazily: single-process deployments never load the client
+        import redis.asyncio as aioredis
+
+        app.bot_data["redis"] = aioredis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=_REDIS_TIMEOUT,
+            socket_timeout=_REDIS_TIMEOUT,
+        )
+
+    logger.info("Application built: parse_mode=%s, cache_ttl=%s", settings.parse_mode, settings.cache_ttl)
+    return app
+
+
+async def _create_http_session(app: Application) -> None:
+    settings: Settings = app.bot_data["settings"]
+    # shared aiohttp session; keep-alive pool sized for bursts against a
+    # single upstream host (api.coingecko.com) so requests reuse warm TLS
+    # connections instead of handshaking per request, and DNS answers are
+    # cached for 5 minutes. aiohttp already asks for gzip/deflate bodies.
+    timeout = aiohttp.ClientTimeout(total=int(settings.http_timeout))
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=16,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+    )
+    session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    app.bot_data["http_session"] = session
+    app.bot_data["price_service"] = PriceService(settings=settings, session=session)
+
+
+async def _post_init(app: Application) -> None:
+    await _create_http_session(app)
+    # awaited because create_task here would run outside the Application's
+    # task tracking (it is not "running" yet); capped so a slow upstream
+    # cannot hold back polling
+    await _warmup_cache(app, DEFAULT_WARMUP_PAIRS)
+
+
+async def _post_shutdown(app: Application) -> None:
+    """
+    Close the shared HTTP session / Redis client and clear caches.
+    Runs once after Application.shutdown().
+    """
+    try:
+        logger.info("Shutdown: closing http session and clearing caches")
+        price_service: PriceService = app.bot_data.get("price_service")
+        if price_service:
+            price_service.clear_cache()
+        session: aiohttp.ClientSession = app.bot_data.get("http_session")
+        if session and not session.closed:
+            await session.close()
+        redis = app.bot_data.get("redis")
+        if redis is not None:
+            await redis.aclose()
+    except Exception:
+        logger.exception("Error during shutdown")
+
+
+async def _warmup_cache(app: Application, pairs: Iterable[tuple[str, str]]) -> None:
+    """
+    Warmup that preloads cache for a small set of pairs.
+    Runs once at startup from post_init and waits at most _WARMUP_TIMEOUT
+    seconds; failures are logged and ignored.
+    """
+    settings: Settings = app.bot_data.get("settings")
+    price_service: PriceService = app.bot_data.get("price_service")
+    if not price_service or not settings:
+        logger.debug("Warmup skipped: missing price_service or settings")
+        return
+
+    # materialize once: pairs may be a one-shot iterator
+    pairs = list(pairs)
+    logger.info("Warmup: preloading price cache for %d pairs", len(pairs))
+
+    # wait but don't fail startup if warmup fails; the misses land in the same
+    # PriceBatcher window, i.e. one upstream request. The fetches are shielded
+    # in PriceService, so on timeout they keep running and still fill the cache
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(_safe_fetch(price_service, base, quote) for base, quote in pairs)),
+            _WARMUP_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Warmup: timed out after %gs, continuing startup", _WARMUP_TIMEOUT)
+        return
+    logger.info("Warmup: completed")
+
+
+async def _safe_fetch(price_service: PriceService, base: str, quote: str) -> None:
+    try:
+        price = await price_service.get_price(base, quote)
+        logger.debug("Warmup fetched %s->%s price=%s", base, quote, price)
+    except Exception:
+        logger.exception("Warmup fetch failed for %s->%s", base, quote)
+
+
+def main() -> None:
+    from .handlers import register_handlers
+
+    app = build_app()
+    register_handlers(app)
+    app.run_polling()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# src/config.py
+"""
+Typed configuration as a plain frozen dataclass loaded from the environment.
+
+Environment keys:
+- BOT_TOKEN (required)
+- CACHE_TTL (default: 60)
+- HTTP_RETRIES (default: 3)
+- HTTP_TIMEOUT (default: 10)
+- PARSE_MODE (default: HTML)
+- RATE_LIMIT_COOLDOWN (default: 0.7)
+- LOG_LEVEL (default: INFO)
+- ALLOWED_CHATS (comma-separated ints; empty=allow all)
+- REDIS_URL (optional; shared rate limiting across workers, e.g. redis://redis:6379/0)
+
+Values from os.environ take precedence over a local .env file.
+
+Provides:
+- Settings: typed access to env values (Settings.from_env())
+- get_settings(): cached Settings instance (env is read and parsed once)
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, Mapping, Optional
+
+# a whole comma/whitespace-delimited integer token; signed so negative IDs
+# (groups/supergroups) and positives (users/chats) both match, while tokens
+# like "12a" are skipped silently
+_ALLOWED_RE = re.compile(r"(?<![^\s,])[-+]?\d+(?![^\s,])")
+
+
+def _parse_allowed(raw: Optional[str]) -> FrozenSet[int]:
+    if not raw:
+        return frozenset()
+    return frozenset(map(int, _ALLOWED_RE.findall(raw)))
+
+
+# an unquoted value ends at whitespace followed by '#'
+_INLINE_COMMENT_RE = re.compile(r"\s+#")
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """
+    Minimal KEY=VALUE reader for .env files, following the dotenv conventions
+    existing files rely on: blank lines and '#' comments are skipped, an
+    'export ' prefix is ignored, quoted values are taken verbatim and
+    unquoted values end at a whitespace-preceded '#' comment. No interpolation or
+    multi-line values.
+    """
+    out: Dict[str, str] = {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, _, value = line.partition("=")
+                key = key.strip()
+                if key.startswith("export "):
+                    key = key[len("export "):].strip()
+                value = value.strip()
+                if value[:1] in ("'", '"') and value.find(value[0], 1) > 0:
+                    value = value[1:value.find(value[0], 1)]
+                else:
+                    value = _INLINE_COMMENT_RE.split(value, 1)[0]
+                out[key.upper()] = value
+    except FileNotFoundError:
+        pass
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    bot_token: str = field(repr=False)
+    cache_ttl: int = 60
+    http_retries: int = 3
+    http_timeout: int = 10
+    parse_mode: str = "HTML"
+    rate_limit_cooldown: float = 0.7
+    log_level: str = "INFO"
+    # normalized set (ints) parsed once from ALLOWED_CHATS; the allowed-chat
+    # check runs on every update, so it must not re-parse the raw string
+    allowed_chats: FrozenSet[int] = frozenset()
+    redis_url: Optional[str] = None
+
+    @classmethod
+    def from_env(
+        cls,
+        environ: Optional[Mapping[str, str]] = None,
+        env_file: Optional[str] = ".env",
+    ) -> "Settings":
+        """
+        Build Settings from environment variables (keys are case-insensitive).
+        Raises ValueError if BOT_TOKEN is missing or a numeric value is malformed.
+        """
+        env = _read_env_file(env_file) if env_file else {}
+        source = os.environ if environ is None else environ
+        env.update((k.upper(), v) for k, v in source.items())
+
+        token = env.get("BOT_TOKEN")
+        if not token:
+            raise ValueError("BOT_TOKEN is required")
+        return cls(
+            bot_token=token,
+            cache_ttl=int(env.get("CACHE_TTL", 60)),
+            http_retries=int(env.get("HTTP_RETRIES", 3)),
+            http_timeout=int(env.get("HTTP_TIMEOUT", 10)),
+            parse_mode=env.get("PARSE_MODE", "HTML"),
+            rate_limit_cooldown=float(env.get("RATE_LIMIT_COOLDOWN", 0.7)),
+            log_level=env.get("LOG_LEVEL", "INFO"),
+            allowed_chats=_parse_allowed(env.get("ALLOWED_CHATS")),
+            redis_url=env.get("REDIS_URL") or None,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance, built on first call.
+    Use get_settings.cache_clear() to force a reload (e.g. in tests).
+    """
+    return Settings.from_env()
@@ -3,8 +3,9 @@
 Telegram handlers
 - Async, type-hinted handlers compatible with python-telegram-bot v20+
 - Centralized parse_mode from app.bot_data
-- Allowed-chats check via settings.is_chat_allowed
-- Lightweight in-memory per-user rate-limit (cooldown seconds) with ability to upgrade to Redis
+- Allowed-chats check via the precomputed settings.allowed_chats frozenset
+- Per-user rate-limit (cooldown seconds): Redis when app.bot_data["redis"] is set
+  (shared across workers), otherwise a bounded in-memory map
 - Uses PriceService from app.bot_data
 - All user-facing text obtained via localization.get_messages(lang)
 - Errors are converted to user-friendly replies and logged
@@ -12,9 +13,10 @@ Telegram handlers
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
-import time
-from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Optional
 
 from telegram import InlineQueryResultArticle, InputTextMessageContent, Update
 from telegram.ext import (
@@ -32,41 +34,77 @@ from .utils import parse_amount_and_pair, format_price
 
 logger = logging.getLogger(__name__)
 
-# simple in-memory rate limiter: user_id -> last_ts
-_RATE_LIMIT_STATE: Dict[int, float] = {}
-# simple per-chat cooldown map: chat_id -> last_ts (optional)
-_CHAT_RATE_LIMIT_STATE: Dict[int, float] = {}
+# simple in-memory rate limiter: user_id -> last_ts, kept in least-recently
+# seen order and capped so long-running bots do not grow one entry per user
+# ever seen (entries that old are far past any cooldown anyway)
+_RATE_LIMIT_STATE: "OrderedDict[int, float]" = OrderedDict()
+_RATE_LIMIT_MAX_USERS = 100_000
+# inline answers are the same for every user, so Telegram may cache them
+# across users; parse failures are cached too so retyping does not re-enter
+_INLINE_CACHE_TIME = 30
+# used when bot_data was built without a cooldown (build_app always sets it)
+_DEFAULT_COOLDOWN = 0.7
 
 
-def _is_allowed_chat(app_bot_data: Dict[str, Any], chat_id: int) -> bool:
-    settings: Settings = app_bot_data.get("settings")
-    if not settings:
-        return True
-    try:
-        return settings.is_chat_allowed(chat_id)
-    except Exception:
-        logger.exception("Error checking allowed_chats")
-        return False
+class _HandlerCtx:
+    """
+    Per-update view of app.bot_data plus the resolved Messages: every lookup
+    a handler needs is done once here and read back as a slot attribute.
+    """
 
+    __slots__ = ("parse_mode", "cooldown", "redis", "price_service", "settings", "msgs")
 
-def _get_parse_mode(app_bot_data: Dict[str, Any]) -> Optional[str]:
-    return app_bot_data.get("parse_mode")
+    def __init__(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        app_data = context.application.bot_data
+        self.parse_mode = app_data.get("parse_mode")
+        self.cooldown = app_data.get("rate_limit_cooldown", _DEFAULT_COOLDOWN)
+        self.redis = app_data.get("redis")
+        self.price_service: Optional[PriceService] = app_data.get("price_service")
+        self.settings: Optional[Settings] = app_data.get("settings")
+        self.msgs = get_messages(_lang_from_update(update))
 
 
-def _get_rate_limit_cooldown(app_bot_data: Dict[str, Any]) -> float:
-    try:
-        return float(app_bot_data.get("rate_limit_cooldown", 0.7))
-    except Exception:
-        return 0.7
+def _is_allowed_chat(ctx: _HandlerCtx, chat_id: int) -> bool:
+    settings = ctx.settings
+    if not settings:
+        return True
+    # empty set means allow all; allowed_chats is a frozenset parsed once
+    # at load, so this is one membership test
+    allowed = settings.allowed_chats
+    return not allowed or chat_id in allowed
+
+
+# atomic fixed-window counter: the first hit in a window sets the expiry,
+# any further hit before it expires is limited
+_RATE_LIMIT_LUA = """
+local c = redis.call('INCR', KEYS[1])
+if c == 1 then redis.call('PEXPIRE', KEYS[1], ARGV[1]) end
+return c
+"""
+
 
+async def _is_rate_limited(ctx: _HandlerCtx, user_id: int) -> bool:
+    redis = ctx.redis
+    if redis is not None:
+        try:
+            count = await redis.eval(_RATE_LIMIT_LUA, 1, f"rl:{user_id}", max(1, int(ctx.cooldown * 1000)))
+            return int(count) > 1
+        except Exception:
+            logger.warning("Redis rate-limit check failed; using in-memory limiter", exc_info=True)
+    return _is_rate_limited_local(user_id, ctx.cooldown)
 
-def _is_rate_limited(user_id: int, app_bot_data: Dict[str, Any]) -> bool:
-    cooldown = _get_rate_limit_cooldown(app_bot_data)
-    now = time.time()
-    last = _RATE_LIMIT_STATE.get(user_id, 0.0)
-    if now - last < cooldown:
+
+def _is_rate_limited_local(user_id: int, cooldown: float) -> bool:
+    # event-loop clock: monotonic, so NTP adjustments cannot lock users out or
+    # reset their cooldown (only called from handlers, i.e. inside the loop)
+    now = asyncio.get_running_loop().time()
+    last = _RATE_LIMIT_STATE.get(user_id)
+    if last is not None and now - last < cooldown:
         return True
     _RATE_LIMIT_STATE[user_id] = now
+    _RATE_LIMIT_STATE.move_to_end(user_id)
+    if len(_RATE_LIMIT_STATE) > _RATE_LIMIT_MAX_USERS:
+        _RATE_LIMIT_STATE.popitem(last=False)
     return False
 
 
@@ -74,22 +112,19 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     """Simple /start handler"""
     if update.effective_chat is None:
         return
-    app_data = context.application.bot_data
-    if not _is_allowed_chat(app_data, update.effective_chat.id):
-        msgs = get_messages(_lang_from_update(update))
-        await update.effective_message.reply_text(msgs.NOT_ALLOWED, parse_mode=_get_parse_mode(app_data))
+    ctx = _HandlerCtx(update, context)
+    if not _is_allowed_chat(ctx, update.effective_chat.id):
+        await update.effective_message.reply_text(ctx.msgs.NOT_ALLOWED, parse_mode=ctx.parse_mode)
         return
 
-    msgs = get_messages(_lang_from_update(update))
-    await update.effective_message.reply_text(msgs.START, parse_mode=_get_parse_mode(app_data))
+    await update.effective_message.reply_text(ctx.msgs.START, parse_mode=ctx.parse_mode)
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if update.effective_chat is None:
         return
-    app_data = context.application.bot_data
-    msgs = get_messages(_lang_from_update(update))
-    await update.effective_message.reply_text(msgs.HELP, parse_mode=_get_parse_mode(app_data))
+    ctx = _HandlerCtx(update, context)
+    await update.effective_message.reply_text(ctx.msgs.HELP, parse_mode=ctx.parse_mode)
 
 
 async def convert_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -100,60 +135,60 @@ async def convert_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if update.effective_message is None or update.effective_chat is None:
         return
 
-    app_data = context.application.bot_data
+    # bot_data lookups and messages resolved once per update
+    ctx = _HandlerCtx(update, context)
+    parse_mode = ctx.parse_mode
+    msgs = ctx.msgs
     chat_id = update.effective_chat.id
     user = update.effective_user
     user_id = user.id if user else 0
 
-    if not _is_allowed_chat(app_data, chat_id):
-        msgs = get_messages(_lang_from_update(update))
-        await update.effective_message.reply_text(msgs.NOT_ALLOWED, parse_mode=_get_parse_mode(app_data))
+    if not _is_allowed_chat(ctx, chat_id):
+        await update.effective_message.reply_text(msgs.NOT_ALLOWED, parse_mode=parse_mode)
         return
 
-    if _is_rate_limited(user_id, app_data):
-        msgs = get_messages(_lang_from_update(update))
-        await update.effective_message.reply_text(msgs.RATE_LIMITED, parse_mode=_get_parse_mode(app_data))
+    if await _is_rate_limited(ctx, user_id):
+        await update.effective_message.reply_text(msgs.RATE_LIMIT, parse_mode=parse_mode)
         return
 
     text = update.effective_message.text or ""
-    msgs = get_messages(_lang_from_update(update))
 
     try:
         amount, base_sym, quote_sym = parse_amount_and_pair(text)
     except ValueError as e:
         logger.debug("Parse error for text=%r: %s", text, e)
-        await update.effective_message.reply_text(msgs.INVALID_QUERY, parse_mode=_get_parse_mode(app_data))
+        await update.effective_message.reply_text(msgs.ERROR, parse_mode=parse_mode)
         return
     except Exception:
         logger.exception("Unexpected parse error")
-        await update.effective_message.reply_text(msgs.ERROR, parse_mode=_get_parse_mode(app_data))
+        await update.effective_message.reply_text(msgs.ERROR, parse_mode=parse_mode)
         return
 
-    price_service: PriceService = app_data.get("price_service")
+    price_service = ctx.price_service
     if not price_service:
         logger.error("PriceService missing in app.bot_data")
-        await update.effective_message.reply_text(msgs.ERROR, parse_mode=_get_parse_mode(app_data))
+        await update.effective_message.reply_text(msgs.ERROR, parse_mode=parse_mode)
         return
 
     try:
         price = await price_service.get_price(base_sym, quote_sym)
     except Exception:
         logger.exception("Price fetch error for %s->%s", base_sym, quote_sym)
-        await update.effective_message.reply_text(msgs.ERROR, parse_mode=_get_parse_mode(app_data))
+        await update.effective_message.reply_text(msgs.ERROR, parse_mode=parse_mode)
         return
 
     if price is None:
-        await update.effective_message.reply_text(msgs.NOT_FOUND.format(base=base_sym, quote=quote_sym), parse_mode=_get_parse_mode(app_data))
+        await update.effective_message.reply_text(msgs.fmt("NOT_FOUND", base=base_sym, quote=quote_sym), parse_mode=parse_mode)
         return
 
     try:
         text_out = format_price(amount, price, base_sym, quote_sym)
     except Exception:
         logger.exception("Formatting error for amount=%s price=%s", amount, price)
-        await update.effective_message.reply_text(msgs.ERROR, parse_mode=_get_parse_mode(app_data))
+        await update.effective_message.reply_text(msgs.ERROR, parse_mode=parse_mode)
         return
 
-    await update.effective_message.reply_text(text_out, parse_mode=_get_parse_mode(app_data))
+    await update.effective_message.reply_text(text_out, parse_mode=parse_mode)
 
 
 async def inline_query_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -164,30 +199,28 @@ async def inline_query_handler(update: Update, context: ContextTypes.DEFAULT_TYP
     if update.inline_query is None:
         return
     query = update.inline_query.query or ""
-    app_data = context.application.bot_data
+    ctx = _HandlerCtx(update, context)
 
     # basic inline rate-limit by user
     user = update.inline_query.from_user
     user_id = user.id if user else 0
-    if _is_rate_limited(user_id, app_data):
+    if await _is_rate_limited(ctx, user_id):
         # return empty results quickly
         await update.inline_query.answer([], cache_time=1)
         return
 
-    msgs = get_messages(_lang_from_update(update))
-
     try:
         amount, base_sym, quote_sym = parse_amount_and_pair(query)
     except ValueError:
         # silently ignore parse errors in inline mode
-        await update.inline_query.answer([], cache_time=1)
+        await update.inline_query.answer([], cache_time=_INLINE_CACHE_TIME)
         return
     except Exception:
         logger.exception("Unexpected inline parse error")
         await update.inline_query.answer([], cache_time=1)
         return
 
-    price_service: PriceService = app_data.get("price_service")
+    price_service = ctx.price_service
     if not price_service:
         await update.inline_query.answer([], cache_time=1)
         return
@@ -204,14 +237,17 @@ async def inline_query_handler(update: Update, context: ContextTypes.DEFAULT_TYP
         await update.inline_query.answer([], cache_time=1)
         return
 
+    # deterministic id: the same query yields the same result, which lets
+    # Telegram serve it from its own cache
+    result_id = hashlib.blake2s(f"{base_sym}|{quote_sym}|{amount}".encode(), digest_size=8).hexdigest()
     result = InlineQueryResultArticle(
-        id=f"{base_sym}-{quote_sym}-{int(time.time())}",
+        id=result_id,
         title=f"{amount} {base_sym} → {quote_sym}",
-        input_message_content=InputTextMessageContent(formatted, parse_mode=_get_parse_mode(app_data)),
+        input_message_content=InputTextMessageContent(formatted, parse_mode=ctx.parse_mode),
         description=formatted,
     )
 
-    await update.inline_query.answer([result], cache_time=5, is_personal=True)
+    await update.inline_query.answer([result], cache_time=_INLINE_CACHE_TIME, is_personal=False)
 
 
 def _lang_from_update(update: Update) -> Optional[str]:
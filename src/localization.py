@@ -5,7 +5,8 @@ English/Persian messages and helpers.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Literal
 
 Lang = Literal["en", "fa"]
@@ -22,13 +23,19 @@ class Messages:
     INLINE_HINT: str
     RATE_LIMIT: str
     NOT_ALLOWED: str
+    NOT_FOUND: str
+
+    def __post_init__(self) -> None:
+        # key -> text map built once; fmt does a plain dict lookup instead of
+        # getattr (which would also resolve methods like "fmt" itself)
+        object.__setattr__(self, "_map", {f.name: getattr(self, f.name) for f in fields(self)})
 
     def fmt(self, key: str, /, **kwargs) -> str:
         """
         Safe formatter: returns formatted value for a message key.
         Usage: messages.fmt("START") or messages.fmt("ERROR", symbol="BTC")
         """
-        val = getattr(self, key, None)
+        val = self._map.get(key)
         if val is None:
             raise KeyError(f"Unknown message key: {key}")
         if kwargs:
@@ -59,6 +66,7 @@ EN = Messages(
     INLINE_HINT="Enter e.g. `btc usd` or `2 eth to cad`",
     RATE_LIMIT="Too many requests. Please wait a moment ⏳",
     NOT_ALLOWED="This chat is not allowed to use the bot 🚫",
+    NOT_FOUND="No price found for {base}/{quote} 🤷",
 )
 
 FA = Messages(
@@ -84,12 +92,14 @@ FA = Messages(
     INLINE_HINT="مثلاً `btc usd` یا `2 eth به cad` وارد کن",
     RATE_LIMIT="درخواست‌های زیاد. چند لحظه صبر کن ⏳",
     NOT_ALLOWED="این چت مجاز به استفاده از ربات نیست 🚫",
+    NOT_FOUND="قیمتی برای {base}/{quote} پیدا نشد 🤷",
 )
 
 
 _SUPPORTED: dict[str, Messages] = {"en": EN, "fa": FA}
 
 
+@lru_cache(maxsize=8)
 def _normalize_lang(lang: str | None) -> str:
     if not lang:
         return "en"
@@ -99,6 +109,7 @@ def _normalize_lang(lang: str | None) -> str:
     return "en"
 
 
+@lru_cache(maxsize=8)
 def get_messages(lang: str | None = None) -> Messages:
     """
     Return Messages for the requested language.
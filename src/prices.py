@@ -0,0 +1,252 @@
+# src/prices.py
+from __future__ import annotations
+import asyncio
+import heapq
+import random
+import sys
+import aiohttp
+import orjson
+from typing import Awaitable, Callable, Iterable, Optional
+from decimal import Decimal
+import time
+import logging
+from functools import lru_cache
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+# lazy bound on the price cache: once it grows past _CACHE_MAX entries,
+# expired ones are dropped and then the _EVICT_BATCH oldest
+_CACHE_MAX = 2048
+_EVICT_BATCH = 256
+# refresh-ahead: a hit older than this fraction of the TTL is still served
+# immediately but triggers one background refresh, so steady traffic on a
+# pair never waits on the CoinGecko round-trip
+_REFRESH_AHEAD = 0.8
+# retry backoff: 0.5s, 1s, 2s, ... capped, plus jitter so concurrent callers
+# do not retry in lockstep
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 8.0
+_BACKOFF_JITTER = 0.2
+# misses arriving within this window share one /simple/price request
+_BATCH_WINDOW = 0.01
+
+Pair = tuple[str, str]
+
+
+@lru_cache(maxsize=256)
+def normalize_symbol(sym: str) -> str:
+    """
+    Case-fold a coin id / currency code once and intern it.
+    Everything downstream (cache keys, request params, response lookup)
+    assumes normalized symbols and never lowers again. The working set of
+    symbols is small, so results are memoized.
+    """
+    return sys.intern(sym.strip().lower())
+
+
+# ticker -> CoinGecko coin id for the most traded coins, so "btc usd" and
+# "bitcoin usd" share one cache entry (and /simple/price, which only knows
+# ids, actually answers the former)
+_COIN_IDS = {
+    "btc": "bitcoin",
+    "eth": "ethereum",
+    "usdt": "tether",
+    "usdc": "usd-coin",
+    "bnb": "binancecoin",
+    "sol": "solana",
+    "xrp": "ripple",
+    "ada": "cardano",
+    "doge": "dogecoin",
+    "trx": "tron",
+    "ton": "the-open-network",
+    "dot": "polkadot",
+    "ltc": "litecoin",
+}
+
+
+def coin_id(sym: str) -> str:
+    """Normalized CoinGecko id for a base symbol: known tickers map to ids."""
+    sym = normalize_symbol(sym)
+    return _COIN_IDS.get(sym, sym)
+
+
+def _pair_key(base: str, quote: str) -> Pair:
+    # tuple keys avoid formatting a new string per cache probe; the base is
+    # resolved to its coin id so ticker and id queries hit the same entry
+    return coin_id(base), normalize_symbol(quote)
+
+
+def _to_decimal(value: int | float) -> Decimal:
+    # ints convert exactly without a string round-trip; for floats str() (the
+    # shortest repr) stays cheaper than Decimal(float).quantize() and avoids
+    # binary-expansion noise like 0.1000000000000000055...
+    if type(value) is int:
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+class PriceBatcher:
+    """
+    Debounces pair lookups: every pair submitted within max_wait seconds of
+    the first one is resolved by a single fetch_many call, i.e. one CoinGecko
+    request for all distinct ids x vs_currencies. Re-submitting a pending
+    pair returns the same future.
+    """
+
+    def __init__(self, fetch_many: Callable[[list[Pair]], Awaitable[dict[Pair, Decimal]]], max_wait: float = _BATCH_WINDOW):
+        self._fetch_many = fetch_many
+        self._max_wait = max_wait
+        self._pending: dict[Pair, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def submit(self, key: Pair) -> asyncio.Future:
+        fut = self._pending.get(key)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._pending[key] = fut
+            if self._timer is None:
+                self._timer = loop.call_later(self._max_wait, self._flush)
+        return fut
+
+    def _flush(self) -> None:
+        self._timer = None
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._resolve(batch))
+        # keep a strong reference until the flush completes
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _resolve(self, batch: dict[Pair, asyncio.Future]) -> None:
+        try:
+            prices = await self._fetch_many(list(batch))
+        except asyncio.CancelledError:
+            # shutdown: waiters must not hang forever
+            for fut in batch.values():
+                fut.cancel()
+            raise
+        except Exception:
+            logger.exception("Batched price fetch failed for %d pairs", len(batch))
+            prices = {}
+        for key, fut in batch.items():
+            if not fut.done():
+                fut.set_result(prices.get(key))
+
+
+class PriceService:
+    def __init__(self, settings: Settings, session: aiohttp.ClientSession):
+        self._session = session
+        self._cache: dict[Pair, tuple[Decimal, float]] = {}
+        self._inflight: dict[Pair, asyncio.Future] = {}
+        self._batcher = PriceBatcher(self._fetch_many)
+        # tunables come from Settings only, so there is a single source of truth
+        self._ttl = settings.cache_ttl
+        self._refresh_after = settings.cache_ttl * _REFRESH_AHEAD
+        self._retries = settings.http_retries
+        self._timeout = settings.http_timeout
+
+    async def get_price(self, base: str, quote: str) -> Optional[Decimal]:
+        key = _pair_key(base, quote)
+        cached = self._cache.get(key)
+        if cached:
+            age = time.monotonic() - cached[1]
+            if age < self._ttl:
+                if age >= self._refresh_after and key not in self._inflight:
+                    self._spawn_fetch(key)
+                return cached[0]
+        # coalesce concurrent misses: only the first caller schedules a fetch,
+        # the rest await the same future (shielded so one cancelled caller does
+        # not cancel it for everybody else)
+        fut = self._inflight.get(key) or self._spawn_fetch(key)
+        return await asyncio.shield(fut)
+
+    def _spawn_fetch(self, key: Pair) -> asyncio.Future:
+        # misses from concurrent updates are batched into one request
+        fut = self._batcher.submit(key)
+        self._inflight[key] = fut
+        fut.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        return fut
+
+    async def get_prices(self, pairs: Iterable[Pair]) -> dict[Pair, Optional[Decimal]]:
+        """
+        Resolve several (base, quote) pairs at once.
+        Cache misses go through the batcher, i.e. a single /simple/price request
+        shared with any concurrent get_price misses; the result is keyed by the
+        normalized (coin id, quote) tuple, None for unknown pairs.
+        """
+        now = time.monotonic()
+        out: dict[Pair, Optional[Decimal]] = {}
+        missing: list[Pair] = []
+        for base, quote in pairs:
+            key = _pair_key(base, quote)
+            cached = self._cache.get(key)
+            if cached and now - cached[1] < self._ttl:
+                out[key] = cached[0]
+            elif key not in out:
+                out[key] = None
+                missing.append(key)
+        if missing:
+            futs = [asyncio.shield(self._inflight.get(key) or self._spawn_fetch(key)) for key in missing]
+            for key, price in zip(missing, await asyncio.gather(*futs)):
+                out[key] = price
+        return out
+
+    async def _fetch_many(self, keys: list[Pair]) -> dict[Pair, Decimal]:
+        # try CoinGecko simple price; ids and vs_currencies both accept CSV lists
+        # and the response holds every id x currency combination, all of which
+        # are cached
+        url = "https://api.coingecko.com/api/v3/simple/price"
+        ids = ",".join(dict.fromkeys(base for base, _ in keys))
+        vs = ",".join(dict.fromkeys(quote for _, quote in keys))
+        params = {"ids": ids, "vs_currencies": vs}
+        for attempt in range(1, self._retries + 1):
+            try:
+                async with self._session.get(url, params=params, timeout=self._timeout) as resp:
+                    if resp.status != 200:
+                        text = await resp.text()
+                        logger.warning("CoinGecko non-200 %s: %s", resp.status, text)
+                        if 400 <= resp.status < 500 and resp.status != 429:
+                            # client errors (unknown id, bad params) never succeed on retry
+                            return {}
+                        raise RuntimeError("Bad response")
+                    data = orjson.loads(await resp.read())
+                    now = time.monotonic()
+                    out: dict[Pair, Decimal] = {}
+                    for base_id, quotes in data.items():
+                        for quote_id, price in quotes.items():
+                            if price is None:
+                                continue
+                            key = _pair_key(base_id, quote_id)
+                            dec = _to_decimal(price)
+                            self._cache[key] = (dec, now)
+                            out[key] = dec
+                    if len(self._cache) > _CACHE_MAX:
+                        self._evict(now)
+                    return out
+            except asyncio.TimeoutError:
+                logger.warning("Timeout fetching prices ids=%s vs=%s attempt=%d", ids, vs, attempt)
+            except Exception as exc:
+                logger.exception("Error fetching prices ids=%s vs=%s attempt=%d: %s", ids, vs, attempt, exc)
+            if attempt < self._retries:
+                delay = min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** (attempt - 1))
+                await asyncio.sleep(delay + random.uniform(0, _BACKOFF_JITTER))
+        return {}
+
+    def _evict(self, now: float) -> None:
+        # timestamps are monotonic, never wall-clock, so NTP jumps cannot
+        # expire or resurrect entries
+        for key in [k for k, (_, ts) in self._cache.items() if now - ts >= self._ttl]:
+            del self._cache[key]
+        if len(self._cache) > _CACHE_MAX:
+            oldest = heapq.nsmallest(_EVICT_BATCH, self._cache.items(), key=lambda kv: kv[1][1])
+            for key, _ in oldest:
+                del self._cache[key]
+
+    def cache_stats(self) -> dict[str, int]:
+        return {"keys": len(self._cache), "inflight": len(self._inflight)}
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
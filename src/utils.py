@@ -0,0 +1,321 @@
+# src/utils.py
+"""
+Utility functions:
+- safe_eval_decimal(expr): evaluate simple arithmetic to Decimal using AST whitelist
+- parse_amount_and_pair(text): extract amount, base, quote (defaults amount=1)
+- format_price(amount, price, base, quote): professional output with thousand separators
+
+Examples:
+  parse_amount_and_pair("1.5 btc to usd") -> (Decimal("1.5"), "BTC", "USD")
+  format_price(Decimal("1.5"), Decimal("2000"), "BTC", "USD")
+"""
+from __future__ import annotations
+
+import ast
+import importlib.util
+import math
+import re
+import sys
+import warnings
+from decimal import Decimal, getcontext
+from functools import lru_cache
+from typing import Callable
+
+if importlib.util.find_spec("_decimal") is None:  # pragma: no cover
+    # decimal silently falls back to the pure-Python _pydecimal instead of
+    # the C/libmpdec _decimal, which is orders of magnitude slower for every
+    # amount and price computation
+    warnings.warn("C _decimal module unavailable; using the slow pure-Python decimal fallback", RuntimeWarning)
+
+
+# set reasonable precision; adjust if needed. Only ever raised, so an
+# embedding application that configured more digits keeps them
+if getcontext().prec < 28:
+    getcontext().prec = 28
+
+# shared Decimal constants for hot paths (Decimal is immutable)
+_ONE = Decimal(1)
+_ZERO = Decimal(0)
+
+_ALLOWED_NODES = frozenset({
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,  # numeric literals only, see _check
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.USub,
+    ast.UAdd,
+    ast.Pow,  # optional; consider removing if you fear large exponents
+    ast.Mod,  # optional
+    ast.FloorDiv,  # optional
+})
+
+_MAX_EXPR_LEN = 64
+_MAX_DEPTH = 10
+
+# most amounts are a bare, possibly signed literal ("1", "-2.5"); those skip
+# ast.parse entirely
+_PLAIN_NUM = re.compile(r"[-+]?\d+(?:\.\d+)?")
+# characters an arithmetic amount can contain (digits, exponent, "_" digit
+# grouping, operators, parens); translate() deletes them, so any leftover
+# character rejects the input before it reaches the parser or the cache
+_EXPR_CHARS_DEL = str.maketrans("", "", "0123456789._eE+-*/%() \t")
+
+
+def _div(left: Decimal, right: Decimal) -> Decimal:
+    # avoid division by zero
+    if right == _ZERO:
+        raise ValueError("Division by zero")
+    return left / right
+
+
+def _pow(left: Decimal, right: Decimal) -> Decimal:
+    # limit exponent to avoid DoS
+    if right > 8:
+        raise ValueError("Exponent too large")
+    return left ** right
+
+
+def _mod(left: Decimal, right: Decimal) -> Decimal:
+    if right == _ZERO:
+        raise ValueError("Division by zero")
+    return left % right
+
+
+def _floordiv(left: Decimal, right: Decimal) -> Decimal:
+    if right == _ZERO:
+        raise ValueError("Division by zero")
+    return left // right
+
+
+def _check(node: ast.AST) -> None:
+    # one iterative DFS checks node types, constants and depth together
+    stack = [(node, 0)]
+    while stack:
+        n, depth = stack.pop()
+        if depth > _MAX_DEPTH:
+            raise ValueError("Expression too deep")
+        if type(n) not in _ALLOWED_NODES:
+            raise ValueError(f"Disallowed node: {type(n).__name__}")
+        # bool is an int subclass; strings/bytes/complex are not amounts
+        if type(n) is ast.Constant and type(n.value) not in (int, float):
+            raise ValueError(f"Disallowed constant: {n.value!r}")
+        depth += 1
+        for child in ast.iter_child_nodes(n):
+            stack.append((child, depth))
+
+
+# dividing operators and ** are compiled to calls of the guards above; the
+# cheap ones (+ - * and unary +/-) stay native bytecode ops
+_GUARDED_OPS = {ast.Div: "_div", ast.Pow: "_pow", ast.Mod: "_mod", ast.FloorDiv: "_floordiv"}
+_GUARDS = {"_div": _div, "_pow": _pow, "_mod": _mod, "_floordiv": _floordiv}
+_NO_ARGS = ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[])
+
+
+class _Lowering(ast.NodeTransformer):
+    """
+    Rewrites a checked expression AST for compile(): every literal becomes a
+    name bound to its precomputed Decimal (or float) in self.namespace, and
+    guarded operators become calls. Recursion is bounded by _MAX_DEPTH.
+    """
+
+    def __init__(self, exact: bool):
+        self.exact = exact
+        self.namespace = {"__builtins__": {}, **_GUARDS}
+
+    def visit_Constant(self, n: ast.Constant) -> ast.AST:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = Decimal(str(n.value)) if self.exact else float(n.value)
+        return ast.Name(name, ast.Load())
+
+    def visit_BinOp(self, n: ast.BinOp) -> ast.AST:
+        self.generic_visit(n)
+        guard = _GUARDED_OPS.get(type(n.op))
+        if guard is None:
+            return n
+        return ast.Call(ast.Name(guard, ast.Load()), [n.left, n.right], [])
+
+
+@lru_cache(maxsize=1024)
+def _compile(expr: str, exact: bool = True) -> Callable[[], Decimal]:
+    """
+    Parse and validate expr once and compile it to a zero-argument function,
+    so evaluation runs as native bytecode with the literals already built.
+    With exact=False literals are floats and the function does float math.
+    Cached: user amounts are short and repetitive.
+    """
+    try:
+        node = ast.parse(expr, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError("Invalid expression") from exc
+    _check(node)
+
+    lowering = _Lowering(exact)
+    body = lowering.visit(node).body
+    tree = ast.fix_missing_locations(ast.Expression(ast.Lambda(_NO_ARGS, body)))
+    # the namespace only holds the guards and literals; no builtins
+    return eval(compile(tree, "<amount>", "eval"), lowering.namespace)
+
+
+def safe_eval_decimal(expr: str, exact: bool = True) -> Decimal:
+    """
+    Safely evaluate a simple arithmetic expression into Decimal.
+    Supports +, -, *, / (and optionally **, %, //) on numeric literals.
+    Raises ValueError on anything else.
+    exact=False evaluates with native floats and converts only the result
+    (shortest repr) to Decimal: faster, but subject to binary rounding, so
+    only for display-grade amounts.
+    Results are memoized on the stripped expression, so " 1.5 " and "1.5"
+    share an entry (Decimals are immutable, sharing them is safe).
+    """
+    return _safe_eval_decimal_impl((expr or "").strip(), exact)
+
+
+@lru_cache(maxsize=512)
+def _safe_eval_decimal_impl(expr: str, exact: bool) -> Decimal:
+    if not expr:
+        raise ValueError("Empty expression")
+    if len(expr) > _MAX_EXPR_LEN:
+        raise ValueError("Expression too long")
+    if _PLAIN_NUM.fullmatch(expr):
+        return Decimal(expr)
+    if expr.translate(_EXPR_CHARS_DEL):
+        raise ValueError("Invalid character in expression")
+    try:
+        result = _compile(expr, exact)()
+    except ArithmeticError as exc:  # decimal.InvalidOperation, float overflow, 0 ** -1
+        raise ValueError("Result out of range") from exc
+    if exact:
+        # 1e999 parses as float inf; Decimal signals turn 0 ** -1 into Infinity
+        if not result.is_finite():
+            raise ValueError("Result out of range")
+        return result
+    # a negative base with a fractional exponent yields a complex number
+    if type(result) is not float or not math.isfinite(result):
+        raise ValueError("Result out of range")
+    return Decimal(repr(result))
+
+
+_PAIR_RE = re.compile(
+    r"""
+    ^\s*
+    (?:(?P<amount>[-+]?\d+(?:\.\d+)?)\s+)?     # optional amount
+    (?P<base>[A-Za-z]{2,10})                   # base symbol
+    \s+(?:to|->|/)\s+                          # separator
+    (?P<quote>[A-Za-z]{2,10})                  # quote symbol
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+
+def _is_symbol(s: str) -> bool:
+    # same language as the symbol groups of _PAIR_RE, without the regex engine
+    return 2 <= len(s) <= 10 and s.isascii() and s.isalpha()
+
+
+def _is_amount(s: str) -> bool:
+    return _PLAIN_NUM.fullmatch(s) is not None
+
+
+# symbol -> interned upper-case form; queries reuse a handful of symbols, so
+# repeats share one string object instead of a fresh upper() each time
+_SYM_CACHE: dict = {}
+_SYM_CACHE_MAX = 256
+
+
+def _upper(sym: str) -> str:
+    up = _SYM_CACHE.get(sym)
+    if up is None:
+        up = sys.intern(sym.upper())
+        if len(_SYM_CACHE) < _SYM_CACHE_MAX:
+            _SYM_CACHE[sym] = up
+    return up
+
+
+# every casing of "to" is listed so the separator token needs no lower()
+_SEPARATORS = frozenset({"to", "To", "tO", "TO", "->", "/"})
+
+
+def _parse_fast(text: str):
+    """
+    Token-based parse of "[amount] BASE (to|->|/) QUOTE" and the unspaced
+    "[amount] BASE/QUOTE". Returns None when the text does not fit, leaving
+    the final verdict to _PAIR_RE.
+    """
+    tokens = text.split()
+    n = len(tokens)
+    if n in (3, 4) and tokens[-2] in _SEPARATORS:
+        base, quote = tokens[-3], tokens[-1]
+    elif n in (1, 2) and "/" in tokens[-1]:
+        base, _, quote = tokens[-1].partition("/")
+    else:
+        return None
+    if not (_is_symbol(base) and _is_symbol(quote)):
+        return None
+    if n % 2 == 0:  # leading amount token
+        if not _is_amount(tokens[0]):
+            return None
+        return Decimal(tokens[0]), _upper(base), _upper(quote)
+    return _ONE, _upper(base), _upper(quote)
+
+
+def parse_amount_and_pair(text: str):
+    """
+    Parse queries like:
+      "eth to usd" -> amount=1, base=ETH, quote=USD
+      "1.5 btc to usd" -> amount=1.5, base=BTC, quote=USD
+      "2 eth/eur" -> amount=2, base=ETH, quote=EUR
+    Raises ValueError on invalid input.
+    """
+    # no strip(): split() and the pattern's \s* anchors ignore outer whitespace
+    text = text or ""
+    parsed = _parse_fast(text)
+    if parsed is not None:
+        return parsed
+    # anything else is either malformed or an edge case of the full pattern
+    m = _PAIR_RE.match(text)
+    if not m:
+        raise ValueError("Invalid query format")
+    amt = m.group("amount")
+    base = _upper(m.group("base"))
+    quote = _upper(m.group("quote"))
+    amount = Decimal(amt) if amt is not None else _ONE
+    return amount, base, quote
+
+
+# fractional digits shown before trailing zeros are trimmed
+_MAX_DECIMALS = 8
+
+
+def _thousands(n: Decimal, max_decimals: int = _MAX_DECIMALS) -> str:
+    # one C-level format does rounding and grouping; then trim the zeros
+    s = f"{n:,.{max_decimals}f}"
+    if "." in s:
+        s = s.rstrip("0").rstrip(".")
+    # values that round to zero keep their sign in the format ("-0")
+    return "0" if s == "-0" else s
+
+
+@lru_cache(maxsize=1024)
+def _format_price_cached(amount_s: str, price_s: str, base: str, quote: str, max_decimals: int) -> str:
+    price = Decimal(price_s)
+    return (
+        f"{amount_s} {base} = {_thousands(Decimal(amount_s) * price, max_decimals)} {quote}\n"
+        f"price: {_thousands(price, max_decimals)} {quote}/{base}"
+    )
+
+
+def format_price(amount: Decimal, price: Decimal, base: str, quote: str, max_decimals: int = _MAX_DECIMALS) -> str:
+    """
+    Format output like:
+      "1.5 BTC = 3,000.00 USD\nprice: 2,000.00 USD/BTC"
+    Uses up to max_decimals fractional digits (trailing zeros trimmed) and
+    thousand separators. Popular pairs repeat the same inputs until the price
+    cache refreshes, so the rendered text is memoized on the str() forms of
+    the Decimals.
+    """
+    return _format_price_cached(str(amount), str(price), base, quote, max_decimals)
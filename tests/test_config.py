@@ -0,0 +1,59 @@
+# tests/test_config.py
+"""
+Tests for src/config.py
+
+- .env parsing: export prefix, inline comments, quoted values
+- os.environ taking precedence over the .env file, case-insensitive keys
+- missing BOT_TOKEN
+- ALLOWED_CHATS token parsing
+"""
+import pytest
+
+from src.config import Settings, _parse_allowed, _read_env_file
+
+def _write_env(tmp_path, text):
+    path = tmp_path / ".env"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_env_file_export_prefix_and_inline_comments(tmp_path):
+    path = _write_env(
+        tmp_path,
+        "# comment\n"
+        "export BOT_TOKEN=abc\n"
+        "CACHE_TTL=30 # seconds\n"
+        'PARSE_MODE="Markdown # kept"\n',
+    )
+    assert _read_env_file(path) == {"BOT_TOKEN": "abc", "CACHE_TTL": "30", "PARSE_MODE": "Markdown # kept"}
+
+    settings = Settings.from_env(environ={}, env_file=path)
+    assert settings.bot_token == "abc"
+    assert settings.cache_ttl == 30
+
+def test_environ_takes_precedence_over_env_file(tmp_path):
+    path = _write_env(tmp_path, "BOT_TOKEN=from-file\nCACHE_TTL=30\n")
+    settings = Settings.from_env(environ={"BOT_TOKEN": "from-env"}, env_file=path)
+    assert settings.bot_token == "from-env"
+    assert settings.cache_ttl == 30
+
+def test_keys_are_case_insensitive(tmp_path):
+    path = _write_env(tmp_path, "cache_ttl=15\n")
+    settings = Settings.from_env(environ={"bot_token": "x", "Http_Retries": "5"}, env_file=path)
+    assert (settings.bot_token, settings.cache_ttl, settings.http_retries) == ("x", 15, 5)
+
+def test_missing_bot_token_raises():
+    with pytest.raises(ValueError):
+        Settings.from_env(environ={"CACHE_TTL": "30"}, env_file=None)
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (None, frozenset()),
+        ("", frozenset()),
+        ("123,-456, 789, 12a", frozenset({123, -456, 789})),
+        ("+5 6,,7", frozenset({5, 6, 7})),
+        ("a1, 2b, -", frozenset()),
+    ],
+)
+def test_parse_allowed(raw, expected):
+    assert _parse_allowed(raw) == expected
@@ -0,0 +1,60 @@
+# tests/test_handlers.py
+"""
+Tests for src/handlers.py rate limiting
+
+- Redis path: the Lua counter result decides, errors fall back to memory
+- in-memory limiter: cooldown and the least-recently-seen cap
+"""
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from src import handlers
+
+class FakeRedis:
+    def __init__(self, result=None, exc=None):
+        self._result = result
+        self._exc = exc
+        self.calls = []
+
+    async def eval(self, script, numkeys, *args):
+        self.calls.append(args)
+        if self._exc is not None:
+            raise self._exc
+        return self._result
+
+def _ctx(redis=None, cooldown=10.0):
+    update = SimpleNamespace(effective_user=None, effective_chat=None)
+    context = SimpleNamespace(application=SimpleNamespace(bot_data={"rate_limit_cooldown": cooldown, "redis": redis}))
+    return handlers._HandlerCtx(update, context)
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(handlers, "_RATE_LIMIT_STATE", OrderedDict())
+
+async def test_redis_count_above_one_is_limited():
+    redis = FakeRedis(result=2)
+    assert await handlers._is_rate_limited(_ctx(redis, cooldown=0.7), 42) is True
+    assert redis.calls == [("rl:42", 700)]
+
+async def test_redis_first_hit_is_not_limited():
+    assert await handlers._is_rate_limited(_ctx(FakeRedis(result=1)), 42) is False
+    # the in-memory limiter was not consulted
+    assert 42 not in handlers._RATE_LIMIT_STATE
+
+async def test_redis_error_falls_back_to_memory():
+    ctx = _ctx(FakeRedis(exc=ConnectionError("down")))
+    assert await handlers._is_rate_limited(ctx, 42) is False
+    assert await handlers._is_rate_limited(ctx, 42) is True
+
+async def test_memory_limiter_cooldown_expires():
+    ctx = _ctx(cooldown=0)
+    assert await handlers._is_rate_limited(ctx, 1) is False
+    assert await handlers._is_rate_limited(ctx, 1) is False
+
+async def test_memory_limiter_evicts_least_recently_seen(monkeypatch):
+    monkeypatch.setattr(handlers, "_RATE_LIMIT_MAX_USERS", 2)
+    for user_id in (1, 2, 1, 3):
+        handlers._is_rate_limited_local(user_id, 0)
+    assert list(handlers._RATE_LIMIT_STATE) == [1, 3]
@@ -0,0 +1,209 @@
+# tests/test_prices.py
+"""
+Tests for src/prices.py PriceService
+
+- Uses pytest and pytest-asyncio (asyncio_mode = auto, see pyproject.toml)
+- Mocks aiohttp responses using simple fake session objects to avoid network calls
+- Verifies caching, retry behavior (via simulated failures), and Decimal conversion
+"""
+import asyncio
+import json
+from decimal import Decimal
+
+from src.prices import PriceService
+from src.config import Settings
+
+class DummyResponse:
+    def __init__(self, status: int, json_data=None, text_data=""):
+        self.status = status
+        self._json = json_data or {}
+        self._text = text_data
+        self.headers = {}
+
+    async def json(self):
+        return self._json
+
+    async def read(self):
+        return json.dumps(self._json).encode()
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+class DummySession:
+    def __init__(self, responses):
+        # responses: list of DummyResponse or exceptions to raise
+        self._responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params, timeout))
+        item = self._responses.pop(0)
+        if isinstance(item, Exception):
+            return RaisingResponse(item)
+        return item
+
+class RaisingResponse:
+    # fails on "async with", like aiohttp does for connection errors/timeouts
+    def __init__(self, exc: Exception):
+        self._exc = exc
+
+    async def __aenter__(self):
+        raise self._exc
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+async def test_get_price_success_caching():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=1, http_timeout=2)
+    # prepare a successful JSON payload
+    data = {"bitcoin": {"usd": 12345.67}}
+    resp = DummyResponse(200, json_data=data)
+    session = DummySession([resp])
+    svc = PriceService(settings=settings, session=session)
+
+    price = await svc.get_price("bitcoin", "usd")
+    assert price == Decimal("12345.67")
+
+    # second call should hit cache and not call session.get again
+    price2 = await svc.get_price("bitcoin", "usd")
+    assert price2 == price
+    assert len(session.calls) == 1
+
+async def test_get_price_retry_and_fail_then_success():
+    settings = Settings(bot_token="x", cache_ttl=1, http_retries=3, http_timeout=1)
+    # first two: server error 500, third: success
+    resp1 = DummyResponse(500, json_data={})
+    resp2 = DummyResponse(500, json_data={})
+    resp3 = DummyResponse(200, json_data={"ethereum": {"usd": 2000}})
+    session = DummySession([resp1, resp2, resp3])
+    svc = PriceService(settings=settings, session=session)
+
+    price = await svc.get_price("ethereum", "usd")
+    assert price == Decimal("2000")
+
+async def test_get_price_not_found_returns_none():
+    settings = Settings(bot_token="x", cache_ttl=1, http_retries=1, http_timeout=1)
+    resp = DummyResponse(200, json_data={"othercoin": {"usd": 1}})
+    session = DummySession([resp])
+    svc = PriceService(settings=settings, session=session)
+
+    price = await svc.get_price("nonexistent", "usd")
+    assert price is None
+
+async def test_clear_cache_and_stats():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=1, http_timeout=1)
+    resp = DummyResponse(200, json_data={"tether": {"usd": 1}})
+    session = DummySession([resp])
+    svc = PriceService(settings=settings, session=session)
+
+    p = await svc.get_price("tether", "usd")
+    assert p == Decimal("1")
+    stats = svc.cache_stats()
+    assert stats["keys"] == 1
+
+    svc.clear_cache()
+    stats2 = svc.cache_stats()
+    assert stats2["keys"] == 0
+
+async def test_concurrent_misses_share_one_request():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=1, http_timeout=1)
+    resp = DummyResponse(200, json_data={"solana": {"usd": 150}})
+    session = DummySession([resp])
+    svc = PriceService(settings=settings, session=session)
+
+    prices = await asyncio.gather(*(svc.get_price("solana", "usd") for _ in range(5)))
+    assert prices == [Decimal("150")] * 5
+    assert len(session.calls) == 1
+
+async def test_get_prices_batches_misses_into_one_request():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=1, http_timeout=1)
+    data = {"bitcoin": {"usd": 60000, "eur": 55000}, "ethereum": {"usd": 3000, "eur": 2800}}
+    session = DummySession([DummyResponse(200, json_data=data)])
+    svc = PriceService(settings=settings, session=session)
+
+    prices = await svc.get_prices([("BTC", "usd"), ("bitcoin", "EUR"), ("ethereum", "usd"), ("nope", "usd")])
+    assert len(session.calls) == 1
+    assert session.calls[0][1] == {"ids": "bitcoin,ethereum,nope", "vs_currencies": "usd,eur"}
+    assert prices[("bitcoin", "usd")] == Decimal("60000")
+    assert prices[("bitcoin", "eur")] == Decimal("55000")
+    assert prices[("ethereum", "usd")] == Decimal("3000")
+    assert prices[("nope", "usd")] is None
+
+    # the whole id x currency grid was cached from that single response
+    assert await svc.get_price("ethereum", "eur") == Decimal("2800")
+    assert len(session.calls) == 1
+
+async def test_ticker_and_coin_id_share_a_cache_entry():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=1, http_timeout=1)
+    session = DummySession([DummyResponse(200, json_data={"bitcoin": {"usd": 60000}})])
+    svc = PriceService(settings=settings, session=session)
+
+    assert await svc.get_price("BTC", "USD") == Decimal("60000")
+    assert await svc.get_price(" bitcoin", "usd") == Decimal("60000")
+    assert session.calls[0][1] == {"ids": "bitcoin", "vs_currencies": "usd"}
+    assert len(session.calls) == 1
+
+async def test_timeout_is_retried(monkeypatch):
+    monkeypatch.setattr("src.prices._BACKOFF_BASE", 0)
+    monkeypatch.setattr("src.prices._BACKOFF_JITTER", 0)
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=2, http_timeout=1)
+    session = DummySession([asyncio.TimeoutError(), DummyResponse(200, json_data={"bitcoin": {"usd": 1}})])
+    svc = PriceService(settings=settings, session=session)
+
+    assert await svc.get_price("bitcoin", "usd") == Decimal("1")
+    assert len(session.calls) == 2
+
+def test_evict_drops_expired_then_oldest(monkeypatch):
+    import src.prices as prices_mod
+
+    monkeypatch.setattr(prices_mod, "_CACHE_MAX", 4)
+    monkeypatch.setattr(prices_mod, "_EVICT_BATCH", 2)
+    settings = Settings(bot_token="x", cache_ttl=10, http_retries=1, http_timeout=1)
+    svc = PriceService(settings=settings, session=DummySession([]))
+    now = 100.0
+    svc._cache[("old", "usd")] = (Decimal("1"), now - 60)  # expired
+    for i in range(5):
+        svc._cache[(f"c{i}", "usd")] = (Decimal("1"), now - 5 + i)
+
+    svc._evict(now)
+    assert ("old", "usd") not in svc._cache
+    assert sorted(k[0] for k in svc._cache) == ["c2", "c3", "c4"]
+
+async def test_near_expiry_hit_is_served_and_refreshed_in_background():
+    import time
+
+    settings = Settings(bot_token="x", cache_ttl=10, http_retries=1, http_timeout=1)
+    session = DummySession([DummyResponse(200, json_data={"bitcoin": {"usd": 70000}})])
+    svc = PriceService(settings=settings, session=session)
+    svc._cache[("bitcoin", "usd")] = (Decimal("69000"), time.monotonic() - 9)
+
+    # stale-ish value comes back without waiting for the network
+    assert await svc.get_price("bitcoin", "usd") == Decimal("69000")
+    await asyncio.gather(*svc._inflight.values())
+    assert len(session.calls) == 1
+    assert await svc.get_price("bitcoin", "usd") == Decimal("70000")
+
+async def test_client_error_is_not_retried():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=3, http_timeout=1)
+    session = DummySession([DummyResponse(404, text_data="not found")])
+    svc = PriceService(settings=settings, session=session)
+
+    assert await svc.get_price("nonexistent", "usd") is None
+    assert len(session.calls) == 1
+
+async def test_concurrent_distinct_pairs_are_batched():
+    settings = Settings(bot_token="x", cache_ttl=60, http_retries=1, http_timeout=1)
+    data = {"bitcoin": {"usd": 60000, "eur": 55000}, "ethereum": {"usd": 3000, "eur": 2800}}
+    session = DummySession([DummyResponse(200, json_data=data)])
+    svc = PriceService(settings=settings, session=session)
+
+    btc_usd, eth_eur = await asyncio.gather(svc.get_price("bitcoin", "usd"), svc.get_price("ethereum", "eur"))
+    assert (btc_usd, eth_eur) == (Decimal("60000"), Decimal("2800"))
+    assert len(session.calls) == 1
+    assert session.calls[0][1] == {"ids": "bitcoin,ethereum", "vs_currencies": "usd,eur"}
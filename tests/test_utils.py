@@ -0,0 +1,66 @@
+# tests/test_utils.py
+"""
+Tests for src/utils.py
+
+- safe_eval_decimal: literal fast path, arithmetic, rejected input, float path
+- parse_amount_and_pair: token fast path agrees with the full pattern
+- format_price: separators, trimmed decimals, sign of small negatives
+"""
+from decimal import Decimal
+import pytest
+
+from src.utils import format_price, parse_amount_and_pair, safe_eval_decimal
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ("1", Decimal("1")),
+        (" 2.5 ", Decimal("2.5")),
+        ("1 + 2", Decimal("3")),
+        ("(1.2 + 0.3) * 2", Decimal("3.0")),
+        ("-3", Decimal("-3")),
+        ("+1.25", Decimal("1.25")),
+        ("2 ** 3", Decimal("8")),
+        ("7 // 2", Decimal("3")),
+    ],
+)
+def test_safe_eval_decimal_values(expr, expected):
+    assert safe_eval_decimal(expr) == expected
+
+@pytest.mark.parametrize("expr", ["", "True + 1", "'a'", "1j", "x + 1", "10 / 0", "2 ** 9", "1" * 65,
+                                  "1e999", "0 ** -1", "(-8) ** 0.5", "1e999-1e999"])
+def test_safe_eval_decimal_rejects(expr):
+    with pytest.raises(ValueError):
+        safe_eval_decimal(expr)
+
+def test_safe_eval_decimal_float_path_is_opt_in():
+    assert safe_eval_decimal("0.1 + 0.2") == Decimal("0.3")
+    assert safe_eval_decimal("0.1 + 0.2", exact=False) == Decimal("0.30000000000000004")
+    with pytest.raises(ValueError):
+        safe_eval_decimal("1e300 * 1e300", exact=False)
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("eth to usd", (Decimal("1"), "ETH", "USD")),
+        ("1.5 btc TO usd", (Decimal("1.5"), "BTC", "USD")),
+        ("-2 btc  to   usd", (Decimal("-2"), "BTC", "USD")),
+        ("btc -> usd", (Decimal("1"), "BTC", "USD")),
+        ("btc / eur", (Decimal("1"), "BTC", "EUR")),
+        ("2 eth/eur", (Decimal("2"), "ETH", "EUR")),
+    ],
+)
+def test_parse_amount_and_pair(text, expected):
+    assert parse_amount_and_pair(text) == expected
+
+@pytest.mark.parametrize("text", ["", "btc usd", "1 2 btc to usd", "btc to usd to eur", "1. btc to usd", "b to usd", "btc/", "1 btc usd eur"])
+def test_parse_amount_and_pair_rejects(text):
+    with pytest.raises(ValueError):
+        parse_amount_and_pair(text)
+
+def test_format_price():
+    out = format_price(Decimal("1.5"), Decimal("65432.10"), "BTC", "USD")
+    assert out == "1.5 BTC = 98,148.15 USD\nprice: 65,432.1 USD/BTC"
+
+def test_format_price_keeps_sign_of_small_negatives():
+    assert format_price(Decimal("-0.0001"), Decimal("2"), "BTC", "USD").startswith("-0.0001 BTC = -0.0002 USD")